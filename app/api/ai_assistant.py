@@ -3,11 +3,13 @@ AI Assistant API Routes
 Chat interface and AI-powered study assistance
 """
 from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Dict, Optional
 from datetime import datetime
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.core.auth import get_current_user
 from app.models.database import User, ChatMessage, ProgressRecord, CareerCounselingSession
@@ -35,6 +37,14 @@ class QuizRequest(BaseModel):
     difficulty: str
     question_count: int = 5
 
+# Items per list in one test batch; each item is a sequential model call
+TEST_BATCH_MAX_ITEMS = 10
+
+class TestBatchRequest(BaseModel):
+    chat: List[ChatRequest] = Field(default_factory=list, max_length=TEST_BATCH_MAX_ITEMS)
+    plans: List[StudyPlanRequest] = Field(default_factory=list, max_length=TEST_BATCH_MAX_ITEMS)
+    quizzes: List[QuizRequest] = Field(default_factory=list, max_length=TEST_BATCH_MAX_ITEMS)
+
 class CareerCounselingRequest(BaseModel):
     target_profession: str
 
@@ -446,6 +456,58 @@ async def convert_career_to_study_plan(
         print(f"Error converting career plan to study plan: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to convert career plan: {str(e)}")
 
+@router.post("/career-counseling/parse-plan/stream")
+async def stream_career_plan_study_tasks(
+    request: ConvertCareerToStudyPlanRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Stream the AI's study-task JSON for a career action plan as it is generated"""
+    
+    career_session = db.query(CareerCounselingSession).filter(
+        CareerCounselingSession.id == request.session_id,
+        CareerCounselingSession.user_id == current_user.id
+    ).first()
+    
+    if not career_session or not career_session.action_plan:
+        raise HTTPException(status_code=404, detail="Career session or action plan not found")
+    
+    # The body is raw model output (JSON, possibly with stray text around it), sent chunk by chunk
+    return StreamingResponse(
+        ai_service.stream_career_plan_study_tasks(career_session.action_plan, career_session.target_profession),
+        media_type="text/plain; charset=utf-8"
+    )
+
+if settings.ENABLE_TEST_ENDPOINTS:
+    @router.post("/_test_batch")
+    async def run_test_batch(
+        request: TestBatchRequest,
+        current_user: User = Depends(get_current_user),
+        db: Session = Depends(get_db)
+    ):
+        """Run several chat / study plan / quiz requests in one round-trip (test scripts only, ENABLE_TEST_ENDPOINTS)"""
+        
+        async def run(handler, item):
+            # Per-item errors are reported in place so one failure doesn't sink the batch
+            try:
+                return {"ok": True, "result": await handler(item, current_user, db)}
+            except HTTPException as e:
+                return {"ok": False, "status_code": e.status_code, "detail": e.detail}
+            except Exception as e:
+                # Leave the shared session usable for the items after this one
+                db.rollback()
+                return {"ok": False, "status_code": 500, "detail": str(e)}
+        
+        async def quiz(item, user, _db):
+            return await generate_quiz(item, user)
+        
+        # Sequential on purpose: the items share one DB session and the model serves one call at a time
+        return {
+            "chat": [await run(chat_with_ai, item) for item in request.chat],
+            "plans": [await run(generate_study_plan, item) for item in request.plans],
+            "quizzes": [await run(quiz, item) for item in request.quizzes]
+        }
+
 @router.get("/chat-history")
 async def get_chat_history(
     current_user: User = Depends(get_current_user),
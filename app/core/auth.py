@@ -43,7 +43,7 @@ def get_password_hash(password: str) -> str:
             password_bytes = password_bytes[:72]
         
         # Generate salt and hash
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
         hashed = bcrypt.hashpw(password_bytes, salt)
         
         # Return as string
@@ -15,6 +15,11 @@ class Settings:
     SECRET_KEY: str = config("SECRET_KEY", default="your-secret-key-change-in-production")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    # bcrypt cost factor for new password hashes; test scripts drop it to the minimum (4)
+    BCRYPT_ROUNDS: int = config("BCRYPT_ROUNDS", default=12, cast=int)
+    
+    # Test-only routes such as /api/ai/_test_batch; never enable in production
+    ENABLE_TEST_ENDPOINTS: bool = config("ENABLE_TEST_ENDPOINTS", default=False, cast=bool)
     
     # Database
     DATABASE_URL: str = config("DATABASE_URL", default="sqlite:///./studywiseai.db")
@@ -22,6 +27,8 @@ class Settings:
     
     # Local AI Configuration (GPT4All - Free!)
     LOCAL_AI_MODEL: str = config("LOCAL_AI_MODEL", default="orca-mini-3b-gguf2-q4_0.gguf")
+    # Load the model in the background at startup; off by default in DEBUG so tests and dev reloads skip it
+    AI_PREWARM: bool = config("AI_PREWARM", default=not DEBUG, cast=bool)
     # Legacy OpenAI config (optional)
     OPENAI_API_KEY: str = config("OPENAI_API_KEY", default="")
     OPENAI_MODEL: str = config("OPENAI_MODEL", default="gpt-3.5-turbo")
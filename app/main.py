@@ -2,16 +2,18 @@
 StudyWiseAI FastAPI Application
 Main application entry point
 """
+import asyncio
 import os
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, Response
 
 from app.core.config import settings
 from app.core.database import create_tables
+from app.services.ai_service import ai_service
 from app.api import auth, study_plans, ai_assistant, progress, reminders
 
 # Create FastAPI instance
@@ -26,8 +28,12 @@ app = FastAPI(
 # Initialize database tables on startup
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on startup"""
+    """Create database tables and start warming the AI model on startup"""
     create_tables()
+    # Warm in the background so the server accepts requests immediately;
+    # AI requests that arrive first wait on the model lock instead of a cold load
+    if settings.AI_PREWARM:
+        app.state.ai_prewarm_task = asyncio.create_task(ai_service.prewarm())
 
 # CORS middleware
 app.add_middleware(
@@ -75,7 +81,14 @@ else:
     @app.get("/", response_class=HTMLResponse)
     async def home(request: Request):
         """Home page route"""
-        return templates.TemplateResponse("index_bulletproof.html", {"request": request})
+        # The page has no per-request data, so the template file's stat is a valid ETag
+        stat = os.stat(os.path.join("frontend/templates", "index_bulletproof.html"))
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        response = templates.TemplateResponse("index_bulletproof.html", {"request": request})
+        response.headers["ETag"] = etag
+        return response
 
     @app.get("/full", response_class=HTMLResponse)
     async def full_page(request: Request):
@@ -92,9 +105,9 @@ else:
         """Progressive test page to identify issues"""
         return templates.TemplateResponse("progressive_test.html", {"request": request})
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (HEAD lets clients probe without a body)"""
     return {"status": "healthy", "message": "StudyWiseAI API is running"}
 
 if __name__ == "__main__":
@@ -4,11 +4,130 @@ Local GPT4All integration for study assistance and chat
 """
 from gpt4all import GPT4All
 from typing import List, Dict, Optional
+from pydantic import BaseModel, ValidationError
 from app.core.config import settings
 from app.models.database import User, StudyPlan, ProgressRecord
 import asyncio
+import copy
 import functools
+import hashlib
+import json
+import os
+import re
+import sys
 import threading
+import types
+from collections import OrderedDict
+from pathlib import Path
+
+# Prompt tokens evaluated per llama.cpp batch; gpt4all defaults to 8, which
+# leaves most of the CPU SIMD throughput unused on our 1-2KB prompts
+PROMPT_BATCH_SIZE = 512
+
+# Parsed study plans for the template fallback of common professions,
+# written at deploy time by precompute_career_plans.py
+PRECOMPUTED_PLANS_PATH = Path(__file__).parent / "precomputed_plans.json"
+
+# Upper bound on in-process parsed-plan results kept for duplicate requests
+PARSED_PLAN_CACHE_SIZE = 512
+
+# Byte-identical across parse_career_plan_to_study_tasks calls
+_PARSE_PLAN_SYSTEM_PROMPT = "You are an educational planner who converts career advice into actionable study plans. Extract specific study tasks, subjects, and create a structured learning schedule."
+
+_PARSE_PLAN_PROMPT_PREFIX = """Parse the career action plan given at the end into a structured study plan format.
+
+Extract and format the information into the following JSON structure:
+
+{
+    "study_materials": {
+        "subjects": ["list of key subjects/courses to study"],
+        "skills": ["list of technical and soft skills to develop"],
+        "resources": ["list of learning resources, books, courses"]
+    },
+    "schedule": {
+        "weekly_tasks": [
+            {
+                "task": "specific study task",
+                "subject": "subject area",
+                "duration": "estimated hours per week",
+                "priority": "high/medium/low",
+                "timeline": "short-term/medium-term/long-term"
+            }
+        ],
+        "daily_activities": [
+            {
+                "activity": "daily practice or learning activity",
+                "duration": "minutes per day",
+                "type": "study/practice/reading"
+            }
+        ]
+    },
+    "milestones": {
+        "short_term": ["goals for next 3-6 months"],
+        "medium_term": ["goals for 6-18 months"],
+        "long_term": ["goals for 1-3 years"]
+    },
+    "tasks": [
+        {
+            "id": 1,
+            "title": "specific actionable task",
+            "description": "detailed description",
+            "category": "study/skill/activity/networking",
+            "estimated_hours": 5,
+            "priority": "high/medium/low",
+            "deadline": "timeframe description"
+        }
+    ]
+}
+
+Extract at least 8-12 specific, actionable study tasks. Be practical and realistic about time estimates.
+Focus on tasks that can be integrated into a weekly study schedule.
+"""
+
+class StudyPlanOut(BaseModel):
+    """Top-level shape of the JSON requested by _PARSE_PLAN_PROMPT_PREFIX"""
+    study_materials: Dict = {}
+    schedule: Dict = {}
+    milestones: Dict = {}
+    tasks: List[Dict] = []
+
+def _render_career_plan_template(d: Dict) -> str:
+    """Assemble a career plan body, leaving {target_profession} as a str.format placeholder"""
+    subjects_list = "\n".join(f"- {s}" for s in d["subjects"])
+    short = "\n".join(f"- ✓ {s}" for s in d["short_term"])
+    medium = "\n".join(f"- ✓ {s}" for s in d["medium_term"])
+    long_ = "\n".join(f"- ✓ {s}" for s in d["long_term"])
+    next_steps = "\n".join(f"{i+1}. {s}" for i, s in enumerate(d["next_steps"]))
+
+    return f"""## Career Action Plan for {{target_profession}}
+
+### 1. KEY SUBJECTS TO FOCUS ON (Build Strong Foundation)
+{subjects_list}
+
+### 2. KEY ACTIVITIES & EXPERIENCES
+{d['activities']}
+
+### 3. SKILL DEVELOPMENT ROADMAP
+{d['skills']}
+
+### 4. EDUCATION PATHWAY
+{d['education']}
+
+### 5. MILESTONES & TIMELINE
+
+**Short-term (6-12 months):**
+{short}
+
+**Medium-term (1-3 years):**
+{medium}
+
+**Long-term (3+ years):**
+{long_}
+
+### Next Steps:
+{next_steps}
+
+Remember: Consistency beats intensity. Dedicate focused time each day and review your progress monthly."""
 
 class AIAssistantService:
     """Service class for local AI-powered study assistance using GPT4All"""
@@ -22,6 +141,25 @@ class AIAssistantService:
         self._model_name_in_use = self.model_name
         self._last_request_time = None
         self._model_lock = threading.Lock()  # Prevent concurrent model access (causes access violations)
+        self._precomputed = self._load_precomputed_plans()
+        self._parsed_plan_cache = OrderedDict()  # LRU of successful parse results
+        self._parsed_plan_cache_lock = threading.Lock()
+
+    @staticmethod
+    def _load_precomputed_plans() -> Dict[str, Dict]:
+        """Load deploy-time parsed plans keyed by lowercase profession"""
+        if not PRECOMPUTED_PLANS_PATH.exists():
+            return {}
+        try:
+            return json.loads(PRECOMPUTED_PLANS_PATH.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable precomputed plans: {e}")
+            return {}
+
+    @staticmethod
+    def _plan_digest(action_plan: str) -> str:
+        """Content hash used to tie a precomputed result to the exact plan text"""
+        return hashlib.sha256(action_plan.encode("utf-8")).hexdigest()
         
     def _cleanup_model(self):
         """Properly close and cleanup the model"""
@@ -37,7 +175,7 @@ class AIAssistantService:
         if self._model is None:
             try:
                 print(f"Loading local AI model: {self._model_name_in_use}...")
-                self._model = GPT4All(self._model_name_in_use)
+                self._model = GPT4All(self._model_name_in_use, n_threads=os.cpu_count())
                 print(f"✅ Model loaded successfully: {self._model_name_in_use}")
             except Exception as e:
                 print(f"⚠️ Failed to load {self._model_name_in_use}: {e}")
@@ -47,7 +185,7 @@ class AIAssistantService:
                     print(f"Trying fallback model: {self.fallback_model_name}...")
                     try:
                         self._model_name_in_use = self.fallback_model_name
-                        self._model = GPT4All(self.fallback_model_name)
+                        self._model = GPT4All(self.fallback_model_name, n_threads=os.cpu_count())
                         print(f"✅ Fallback model loaded: {self.fallback_model_name}")
                     except Exception as e2:
                         print(f"❌ Fallback model also failed: {e2}")
@@ -55,16 +193,43 @@ class AIAssistantService:
                 else:
                     raise Exception(f"Failed to load model: {e}")
         return self._model
+
+    async def prewarm(self):
+        """Load the model and run a 1-token generation so the first request hits a warm model"""
+        def warm():
+            with self._model_lock:
+                model = self._get_model()
+                model.generate("hi", max_tokens=1)
+
+        try:
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, warm)
+            print("[AI] Model prewarmed")
+        except Exception as e:
+            print(f"[AI] Model prewarm failed, will load on first request: {e}")
         
+    @staticmethod
+    def _format_prompt(prompt: str, system_prompt: str = None) -> str:
+        """Wrap a prompt in the orca-mini instruction format"""
+        # Use orca-mini instruction format: ### System / ### User / ### Response
+        # Without this format the model outputs nothing (0 chars)
+        if system_prompt:
+            return f"### System:\n{system_prompt}\n\n### User:\n{prompt}\n\n### Response:\n"
+        return f"### User:\n{prompt}\n\n### Response:\n"
+
+    def _handle_generation_error(self, generation_error: Exception):
+        """Log a generation failure and drop the model if it hit a memory error"""
+        error_str = str(generation_error)
+        print(f"[AI] Generation error: {error_str}")
+        # On memory/access violation, clean up model so next call reloads it fresh
+        if "access violation" in error_str.lower() or "segmentation" in error_str.lower():
+            print("[AI] Detected memory error, cleaning up model for next request...")
+            self._cleanup_model()
+
     async def _generate_response(self, prompt: str, system_prompt: str = None) -> Dict:
         """Generate response using local GPT4All model"""
         try:
-            # Use orca-mini instruction format: ### System / ### User / ### Response
-            # Without this format the model outputs nothing (0 chars)
-            if system_prompt:
-                full_prompt = f"### System:\n{system_prompt}\n\n### User:\n{prompt}\n\n### Response:\n"
-            else:
-                full_prompt = f"### User:\n{prompt}\n\n### Response:\n"
+            full_prompt = self._format_prompt(prompt, system_prompt)
                 
             # Run model generation in thread pool to avoid blocking
             # Lock ensures only one generation runs at a time - concurrent access causes access violations
@@ -78,16 +243,12 @@ class AIAssistantService:
                             full_prompt,
                             max_tokens=600,
                             temp=0.3,
-                            top_p=0.7
+                            top_p=0.7,
+                            n_batch=PROMPT_BATCH_SIZE
                         )
                         return response
                     except Exception as generation_error:
-                        error_str = str(generation_error)
-                        print(f"[AI] Generation error: {error_str}")
-                        # On memory/access violation, clean up model so next call reloads it fresh
-                        if "access violation" in error_str.lower() or "segmentation" in error_str.lower():
-                            print("[AI] Detected memory error, cleaning up model for next request...")
-                            self._cleanup_model()
+                        self._handle_generation_error(generation_error)
                         raise
             
             response = await loop.run_in_executor(None, generate)
@@ -104,6 +265,43 @@ class AIAssistantService:
                 "success": False,
                 "error": f"Local AI error: {str(e)}"
             }
+
+    async def _generate_response_stream(self, prompt: str, system_prompt: str = None):
+        """Yield response text chunks from the local model as they are generated"""
+        full_prompt = self._format_prompt(prompt, system_prompt)
+        loop = asyncio.get_event_loop()
+        queue = asyncio.Queue()
+        done = object()
+
+        # The worker thread pushes tokens onto the event loop's queue as the model emits them
+        def generate():
+            with self._model_lock:
+                try:
+                    model = self._get_model()
+                    for token in model.generate(
+                        full_prompt,
+                        max_tokens=600,
+                        temp=0.3,
+                        top_p=0.7,
+                        n_batch=PROMPT_BATCH_SIZE,
+                        streaming=True
+                    ):
+                        loop.call_soon_threadsafe(queue.put_nowait, token)
+                except Exception as generation_error:
+                    self._handle_generation_error(generation_error)
+                    loop.call_soon_threadsafe(queue.put_nowait, generation_error)
+                finally:
+                    loop.call_soon_threadsafe(queue.put_nowait, done)
+
+        worker = loop.run_in_executor(None, generate)
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await worker
         
     async def generate_study_plan(
         self, 
@@ -280,7 +478,6 @@ class AIAssistantService:
 
     def _get_career_questions_template(self, target_profession: str) -> Dict:
         """Fallback template for career counseling questions — profession-aware"""
-        d = self._get_profession_plan_data(target_profession)
         prof_lower = target_profession.lower()
 
         # Tailor question 1 based on profession category
@@ -666,23 +863,17 @@ Be specific and actionable."""
         },
     }
 
-    def _get_profession_plan_data(self, target_profession: str) -> dict:
-        """Match profession to the closest plan category"""
-        prof_lower = target_profession.lower()
-        for category, data in self._PROFESSION_PLANS.items():
-            if any(kw in prof_lower for kw in data["keywords"]):
-                return data
-        # Generic fallback
-        return {
-            "subjects": [
-                f"Core Theory & Fundamentals of {target_profession}",
-                "Research Methods & Critical Thinking",
-                "Professional Ethics & Standards",
-                "Communication & Presentation Skills",
-                "Industry Tools & Technologies",
-                "Business & Project Management Basics",
-            ],
-            "activities": f"""**Practical Experience:**
+    # Generic plan used when no category matches; {target_profession} is filled per call
+    _GENERIC_PLAN = {
+        "subjects": [
+            "Core Theory & Fundamentals of {target_profession}",
+            "Research Methods & Critical Thinking",
+            "Professional Ethics & Standards",
+            "Communication & Presentation Skills",
+            "Industry Tools & Technologies",
+            "Business & Project Management Basics",
+        ],
+        "activities": """**Practical Experience:**
 - Internships or work placements in {target_profession} settings
 - Volunteering with relevant organisations
 - Entry-level or part-time roles in the field
@@ -700,7 +891,7 @@ Be specific and actionable."""
 - Industry conferences and events
 - Connect with established {target_profession} practitioners
 - Join LinkedIn groups for the field""",
-            "skills": f"""**Technical Skills:**
+        "skills": """**Technical Skills:**
 - Year 1-2: Core knowledge and foundational skills
 - Year 2-3: Applied skills and specialisation
 - Year 3+: Advanced expertise and leadership
@@ -710,78 +901,74 @@ Be specific and actionable."""
 - Analytical and problem-solving thinking
 - Professionalism and work ethics
 - Continuous learning mindset""",
-            "education": f"""- **Relevant Degree**: Undergraduate in a related discipline (3-4 years)
+        "education": """- **Relevant Degree**: Undergraduate in a related discipline (3-4 years)
 - **Professional Qualifications**: As required for {target_profession}
 - **Continuing Education**: Industry workshops and short courses
 - **Advanced Study** (optional): Postgraduate or master's degree""",
-            "short_term": [
-                f"Build foundational knowledge in {target_profession}",
-                "Gain initial practical or volunteer experience",
-                "Identify key certifications or qualifications required",
-                "Connect with 2-3 mentors in the field",
-                "Develop a personal learning roadmap",
-            ],
-            "medium_term": [
-                "Complete required qualifications or degrees",
-                "Accumulate meaningful work experience",
-                "Develop a professional portfolio or track record",
-                "Achieve industry certifications",
-                "Build a professional network in the field",
-            ],
-            "long_term": [
-                f"Establish yourself as a practising {target_profession}",
-                "Develop a specialisation or area of expertise",
-                "Take on leadership or senior responsibilities",
-                "Mentor others entering the field",
-                "Contribute to industry advancement",
-            ],
-            "next_steps": [
-                f"Research the exact qualification path for {target_profession} in your country",
-                "Identify and reach out to 2 practitioners for informational interviews",
-                "Enrol in or audit a foundational course this month",
-                "Find a volunteering or shadowing opportunity within 4 weeks",
-                "Set 3-month learning goals and review weekly",
-            ]
-        }
-
-    def _get_career_plan_template(self, target_profession: str) -> Dict:
-        """Fallback template for career action plans — profession-aware"""
-        d = self._get_profession_plan_data(target_profession)
-        subjects_list = "\n".join(f"- {s}" for s in d["subjects"])
-        short = "\n".join(f"- ✓ {s}" for s in d["short_term"])
-        medium = "\n".join(f"- ✓ {s}" for s in d["medium_term"])
-        long_ = "\n".join(f"- ✓ {s}" for s in d["long_term"])
-        next_steps = "\n".join(f"{i+1}. {s}" for i, s in enumerate(d["next_steps"]))
-
-        plan = f"""## Career Action Plan for {target_profession}
-
-### 1. KEY SUBJECTS TO FOCUS ON (Build Strong Foundation)
-{subjects_list}
-
-### 2. KEY ACTIVITIES & EXPERIENCES
-{d['activities']}
-
-### 3. SKILL DEVELOPMENT ROADMAP
-{d['skills']}
-
-### 4. EDUCATION PATHWAY
-{d['education']}
-
-### 5. MILESTONES & TIMELINE
-
-**Short-term (6-12 months):**
-{short}
+        "short_term": [
+            "Build foundational knowledge in {target_profession}",
+            "Gain initial practical or volunteer experience",
+            "Identify key certifications or qualifications required",
+            "Connect with 2-3 mentors in the field",
+            "Develop a personal learning roadmap",
+        ],
+        "medium_term": [
+            "Complete required qualifications or degrees",
+            "Accumulate meaningful work experience",
+            "Develop a professional portfolio or track record",
+            "Achieve industry certifications",
+            "Build a professional network in the field",
+        ],
+        "long_term": [
+            "Establish yourself as a practising {target_profession}",
+            "Develop a specialisation or area of expertise",
+            "Take on leadership or senior responsibilities",
+            "Mentor others entering the field",
+            "Contribute to industry advancement",
+        ],
+        "next_steps": [
+            "Research the exact qualification path for {target_profession} in your country",
+            "Identify and reach out to 2 practitioners for informational interviews",
+            "Enrol in or audit a foundational course this month",
+            "Find a volunteering or shadowing opportunity within 4 weeks",
+            "Set 3-month learning goals and review weekly",
+        ]
+    }
 
-**Medium-term (1-3 years):**
-{medium}
+    # Plan bodies are assembled once at class creation; only the profession is filled per call
+    _GENERIC_PLAN_TEMPLATE = _render_career_plan_template(_GENERIC_PLAN)
+    # Keywords are folded into one compiled alternation per category so a lookup
+    # is a single regex scan per category instead of one substring test per keyword
+    for _plan in _PROFESSION_PLANS.values():
+        _plan["keywords"] = tuple(sys.intern(kw) for kw in _plan["keywords"])
+        _plan["_rendered"] = _render_career_plan_template(_plan)
+        _plan["_keyword_re"] = re.compile("|".join(map(re.escape, _plan["keywords"])))
+    del _plan
+    # Read-only view: the table is shared by every request thread
+    _PROFESSION_PLANS = types.MappingProxyType(_PROFESSION_PLANS)
 
-**Long-term (3+ years):**
-{long_}
+    @classmethod
+    def _scan_profession_plan(cls, prof_lower: str) -> Optional[dict]:
+        """Return the first category whose keywords occur in the lowercased profession"""
+        for data in cls._PROFESSION_PLANS.values():
+            if data["_keyword_re"].search(prof_lower):
+                return data
+        return None
 
-### Next Steps:
-{next_steps}
+    def _find_profession_plan(self, target_profession: str) -> Optional[dict]:
+        """Return the plan category matching the profession, or None"""
+        prof_lower = target_profession.lower()
+        # Most requests name a profession that is itself a keyword ("doctor", "lawyer")
+        data = self._KEYWORD_TO_PLAN.get(prof_lower.strip())
+        if data is not None:
+            return data
+        return self._scan_profession_plan(prof_lower)
 
-Remember: Consistency beats intensity. Dedicate focused time each day and review your progress monthly."""
+    def _get_career_plan_template(self, target_profession: str) -> Dict:
+        """Fallback template for career action plans — profession-aware"""
+        d = self._find_profession_plan(target_profession)
+        template = d["_rendered"] if d is not None else self._GENERIC_PLAN_TEMPLATE
+        plan = template.format(target_profession=target_profession)
 
         return {
             "success": True,
@@ -796,64 +983,105 @@ Remember: Consistency beats intensity. Dedicate focused time each day and review
         target_profession: str
     ) -> Dict:
         """Parse career action plan into structured study tasks and schedule"""
+        key, cached = self._lookup_parsed_plan(action_plan, target_profession)
+        if cached is not None:
+            return cached
 
-        system_prompt = "You are an educational planner who converts career advice into actionable study plans. Extract specific study tasks, subjects, and create a structured learning schedule."
+        user_prompt = self._build_parse_plan_prompt(action_plan, target_profession)
+        result = await self._generate_response(user_prompt, _PARSE_PLAN_SYSTEM_PROMPT)
+        if result.get("success"):
+            result["parsed"] = self._parse_study_plan_json(result["response"])
+            # Output that didn't validate is not cached, so a retry regenerates it
+            if result["parsed"] is not None:
+                self._store_parsed_plan(key, result)
+        return result
 
-        user_prompt = f"""
-        Parse the following career action plan for {target_profession} into a structured study plan format.
-
-        Career Action Plan:
-        {action_plan}
-
-        Extract and format the information into the following JSON structure:
-
-        {{
-            "study_materials": {{
-                "subjects": ["list of key subjects/courses to study"],
-                "skills": ["list of technical and soft skills to develop"],
-                "resources": ["list of learning resources, books, courses"]
-            }},
-            "schedule": {{
-                "weekly_tasks": [
-                    {{
-                        "task": "specific study task",
-                        "subject": "subject area",
-                        "duration": "estimated hours per week",
-                        "priority": "high/medium/low",
-                        "timeline": "short-term/medium-term/long-term"
-                    }}
-                ],
-                "daily_activities": [
-                    {{
-                        "activity": "daily practice or learning activity",
-                        "duration": "minutes per day",
-                        "type": "study/practice/reading"
-                    }}
-                ]
-            }},
-            "milestones": {{
-                "short_term": ["goals for next 3-6 months"],
-                "medium_term": ["goals for 6-18 months"],
-                "long_term": ["goals for 1-3 years"]
-            }},
-            "tasks": [
-                {{
-                    "id": 1,
-                    "title": "specific actionable task",
-                    "description": "detailed description",
-                    "category": "study/skill/activity/networking",
-                    "estimated_hours": 5,
-                    "priority": "high/medium/low",
-                    "deadline": "timeframe description"
-                }}
-            ]
-        }}
+    async def stream_career_plan_study_tasks(
+        self,
+        action_plan: str,
+        target_profession: str
+    ):
+        """Stream the parsed study plan JSON text as the model generates it; the finished result is cached"""
+        key, cached = self._lookup_parsed_plan(action_plan, target_profession)
+        if cached is not None:
+            yield cached["response"]
+            return
 
-        Extract at least 8-12 specific, actionable study tasks. Be practical and realistic about time estimates.
-        Focus on tasks that can be integrated into a weekly study schedule.
-        """
+        user_prompt = self._build_parse_plan_prompt(action_plan, target_profession)
+        chunks = []
+        async for chunk in self._generate_response_stream(user_prompt, _PARSE_PLAN_SYSTEM_PROMPT):
+            chunks.append(chunk)
+            yield chunk
 
-        return await self._generate_response(user_prompt, system_prompt)
+        # Only a stream that ran to completion and validated is cached, in the same shape
+        # parse_career_plan_to_study_tasks returns
+        response = "".join(chunks).strip()
+        parsed = self._parse_study_plan_json(response)
+        if parsed is not None:
+            self._store_parsed_plan(key, {
+                "success": True,
+                "response": response,
+                "usage": "local",
+                "parsed": parsed
+            })
+
+    def _lookup_parsed_plan(self, action_plan: str, target_profession: str):
+        """(cache key, copy of an earlier parse result or None) for a plan"""
+        # Template-fallback plans for common professions are parsed at deploy time;
+        # the digest check ensures a personalised AI plan never gets a canned result
+        precomputed = self._precomputed.get(target_profession.strip().lower())
+        if precomputed and precomputed["plan_sha256"] == self._plan_digest(action_plan):
+            return None, copy.deepcopy(precomputed["result"])
+
+        # Retries and multi-tab submissions resend the same plan; serve those from memory
+        key = hashlib.blake2b(f"{target_profession}\x00{action_plan}".encode("utf-8"), digest_size=16).digest()
+        with self._parsed_plan_cache_lock:
+            cached = self._parsed_plan_cache.get(key)
+            if cached is not None:
+                self._parsed_plan_cache.move_to_end(key)
+        # Callers get their own copy so nothing they change leaks into the cache
+        return key, copy.deepcopy(cached)
+
+    def _store_parsed_plan(self, key: bytes, result: Dict):
+        """Remember a successful parse result, evicting the least recently used one"""
+        # Stored as a copy: the caller goes on to return (and may change) its own result
+        result = copy.deepcopy(result)
+        with self._parsed_plan_cache_lock:
+            self._parsed_plan_cache[key] = result
+            if len(self._parsed_plan_cache) > PARSED_PLAN_CACHE_SIZE:
+                self._parsed_plan_cache.popitem(last=False)
+
+    @staticmethod
+    def _build_parse_plan_prompt(action_plan: str, target_profession: str) -> str:
+        """Build the parse-plan user prompt"""
+        # Invariant instructions and schema go first so backends with prefix/KV
+        # caching can reuse them; only the trailing profession and plan vary
+        return f"""{_PARSE_PLAN_PROMPT_PREFIX}
+Profession: {target_profession}
+
+Career Action Plan:
+{action_plan}
+"""
+
+    @staticmethod
+    def _parse_study_plan_json(text: str) -> Optional[Dict]:
+        """Validate the model's JSON output once; None if it is missing or malformed"""
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            return StudyPlanOut.model_validate_json(text[start:end + 1]).model_dump()
+        except ValidationError as e:
+            print(f"[AI] Study plan JSON did not validate: {e.error_count()} error(s)")
+            return None
+
+# Exact keyword -> plan index; each entry is resolved with the scan itself so
+# overlapping keywords (e.g. "biomedical" contains "medical") keep scan priority
+AIAssistantService._KEYWORD_TO_PLAN = {
+    kw: AIAssistantService._scan_profession_plan(kw)
+    for data in AIAssistantService._PROFESSION_PLANS.values()
+    for kw in data["keywords"]
+}
 
 # Create service instance
 ai_service = AIAssistantService()
\ No newline at end of file
@@ -0,0 +1,19 @@
+"""
+pytest fixtures for the test scripts in the project root
+"""
+import pytest
+
+from tests._harness import TEST_BCRYPT_ROUNDS, get_app_client
+
+@pytest.fixture(scope="session")
+def auth_session():
+    """In-process TestClient logged in as the cached test user, shared by every test in the run"""
+    session = get_app_client()
+    yield session
+    session.close()
+
+@pytest.fixture
+def cheap_bcrypt(monkeypatch):
+    """Hash with TEST_BCRYPT_ROUNDS during one test; opt in with pytest.mark.usefixtures("cheap_bcrypt")"""
+    from app.core.config import settings
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", TEST_BCRYPT_ROUNDS)
@@ -2,16 +2,26 @@
 """
 Debug Database and Try Fresh Credentials
 """
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import random
+import sys
+import uuid
+
+BASE_URL = "http://localhost:8000"
+
+# Shared session so register and login reuse one keep-alive connection
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=4))
 
 def test_with_fresh_credentials():
     """Test with completely fresh credentials"""
     print("🆕 Testing with FRESH credentials...")
     
     # Generate unique credentials
-    user_id = random.randint(1000, 9999)
+    user_id = uuid.uuid4().hex[:8]
     user_data = {
         "email": f"fresh{user_id}@example.com",
         "username": f"fresh{user_id}",
@@ -27,9 +37,9 @@ def test_with_fresh_credentials():
     # Register
     try:
         print("\n📝 Registering fresh user...")
-        response = requests.post("http://localhost:8000/api/auth/register", 
-                               json=user_data, 
-                               timeout=10)
+        response = _SESSION.post("http://localhost:8000/api/auth/register", 
+                                 json=user_data, 
+                                 timeout=10)
         
         print(f"Registration Status: {response.status_code}")
         if response.status_code != 200:
@@ -44,9 +54,9 @@ def test_with_fresh_credentials():
             "password": user_data["password"]
         }
         
-        response = requests.post("http://localhost:8000/api/auth/login", 
-                               data=login_data,
-                               timeout=10)
+        response = _SESSION.post("http://localhost:8000/api/auth/login", 
+                                 data=login_data,
+                                 timeout=10)
         
         print(f"Login Status: {response.status_code}")
         if response.status_code == 200:
@@ -62,6 +72,38 @@ def test_with_fresh_credentials():
         print(f"❌ Error: {e}")
         return False
 
+async def register_and_login(client, user_id):
+    """Register a fresh user and log in with its email; True if both succeed"""
+    user_data = {
+        "email": f"fresh{user_id}@example.com",
+        "username": f"fresh{user_id}",
+        "password": "freshpass123",
+        "full_name": "Fresh Test User"
+    }
+    response = await client.post("/api/auth/register", json=user_data)
+    if response.status_code != 200:
+        return False
+    response = await client.post("/api/auth/login",
+                                 data={"username": user_data["email"], "password": user_data["password"]})
+    return response.status_code == 200
+
+async def stress_fresh_logins(count=10):
+    """Run several fresh register -> login flows concurrently"""
+    print(f"🏋️ Stress testing {count} concurrent fresh register -> login flows...")
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=30,
+                                 limits=httpx.Limits(max_keepalive_connections=count)) as client:
+        results = await asyncio.gather(
+            *(register_and_login(client, uuid.uuid4().hex[:8]) for _ in range(count)),
+            return_exceptions=True
+        )
+
+    passed = sum(1 for result in results if result is True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"❌ Error: {result}")
+    print(f"{'✅' if passed == count else '❌'} {passed}/{count} flows succeeded")
+    return passed == count
+
 def check_existing_user():
     """Check what's wrong with the existing test@example.com user"""
     print("🔍 Checking existing user issue...")
@@ -114,6 +156,13 @@ def check_existing_user():
 def main():
     print("🔧 DEBUG: Login Issue Analysis")
     print("=" * 40)
+
+    # --stress [N]: hammer the auth flow with N concurrent fresh users instead
+    if "--stress" in sys.argv:
+        index = sys.argv.index("--stress")
+        count = int(sys.argv[index + 1]) if len(sys.argv) > index + 1 else 10
+        asyncio.run(stress_fresh_logins(count))
+        return
     
     # First try fresh credentials to see if auth system works
     fresh_works = test_with_fresh_credentials()
@@ -3,10 +3,18 @@
 Debug Test 1.3 Login Issue
 Tests the exact credentials from TEST_PLAN.md to see why login is failing
 """
-import requests
+import asyncio
+import httpx
 import json
+import logging
+import sys
 
-def test_registration():
+BASE_URL = "http://localhost:8000"
+
+# Full response bodies are only decoded and shown with --verbose
+logger = logging.getLogger(__name__)
+
+async def test_registration(client):
     """Test registration with exact credentials from Test 1.3"""
     print("🔐 Testing Registration (Test 1.3 credentials)...")
     
@@ -19,12 +27,11 @@ def test_registration():
     }
     
     try:
-        response = requests.post("http://localhost:8000/api/auth/register", 
-                               json=user_data, 
-                               timeout=10)
+        response = await client.post("/api/auth/register", json=user_data)
         
         print(f"Registration Status: {response.status_code}")
-        print(f"Registration Response: {response.text}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Registration Response: %s", response.text)
         
         if response.status_code == 200:
             print("✅ Registration successful!")
@@ -37,7 +44,7 @@ def test_registration():
         print(f"❌ Registration error: {e}")
         return False
 
-def test_login_with_email():
+async def test_login_with_email(client):
     """Test login using EMAIL (as shown in frontend JavaScript)"""
     print("\n🔑 Testing Login with EMAIL...")
     
@@ -48,12 +55,12 @@ def test_login_with_email():
     }
     
     try:
-        response = requests.post("http://localhost:8000/api/auth/login", 
-                               data=login_data,  # OAuth2 uses form data, not JSON
-                               timeout=10)
+        response = await client.post("/api/auth/login",
+                                     data=login_data)  # OAuth2 uses form data, not JSON
         
         print(f"Email Login Status: {response.status_code}")
-        print(f"Email Login Response: {response.text}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Email Login Response: %s", response.text)
         
         if response.status_code == 200:
             print("✅ Email login successful!")
@@ -68,7 +75,7 @@ def test_login_with_email():
         print(f"❌ Email login error: {e}")
         return False
 
-def test_login_with_username():
+async def test_login_with_username(client):
     """Test login using USERNAME"""
     print("\n🔑 Testing Login with USERNAME...")
     
@@ -79,12 +86,11 @@ def test_login_with_username():
     }
     
     try:
-        response = requests.post("http://localhost:8000/api/auth/login", 
-                               data=login_data,
-                               timeout=10)
+        response = await client.post("/api/auth/login", data=login_data)
         
         print(f"Username Login Status: {response.status_code}")
-        print(f"Username Login Response: {response.text}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Username Login Response: %s", response.text)
         
         if response.status_code == 200:
             print("✅ Username login successful!")
@@ -99,12 +105,12 @@ def test_login_with_username():
         print(f"❌ Username login error: {e}")
         return False
 
-def test_website_accessibility():
+async def test_website_accessibility(client):
     """Test if website is accessible"""
     print("\n🌐 Testing Website Accessibility...")
     
     try:
-        response = requests.get("http://localhost:8000", timeout=5)
+        response = await client.get("/", timeout=5)
         if response.status_code == 200 and "StudyWise" in response.text:
             print("✅ Website loads correctly")
             print("✅ You should be able to access http://localhost:8000")
@@ -116,7 +122,9 @@ def test_website_accessibility():
         print(f"❌ Website error: {e}")
         return False
 
-def main():
+async def main():
+    logging.basicConfig(level=logging.DEBUG if "--verbose" in sys.argv else logging.INFO,
+                        format="%(message)s")
     print("🔍 DEBUG: Test 1.3 Login Issue")
     print("=" * 50)
     print("Testing the exact credentials from TEST_PLAN.md:")
@@ -126,20 +134,25 @@ def main():
     print("- Full Name: Test User")
     print("-" * 50)
     
-    # Test website accessibility
-    if not test_website_accessibility():
-        print("❌ Cannot proceed - website not accessible")
-        return
-    
-    # Test registration first
-    registration_success = test_registration()
-    
-    if not registration_success:
-        print("⚠️ Registration failed, but login might still work if user exists")
-    
-    # Test both login methods
-    email_login = test_login_with_email()
-    username_login = test_login_with_username()
+    # One keep-alive connection pool shared by every probe
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=10,
+                                 limits=httpx.Limits(max_keepalive_connections=4)) as client:
+        # Test website accessibility
+        if not await test_website_accessibility(client):
+            print("❌ Cannot proceed - website not accessible")
+            return
+        
+        # Test registration first
+        registration_success = await test_registration(client)
+        
+        if not registration_success:
+            print("⚠️ Registration failed, but login might still work if user exists")
+        
+        # Both login methods are independent once the user exists, so probe them concurrently
+        email_login, username_login = await asyncio.gather(
+            test_login_with_email(client),
+            test_login_with_username(client)
+        )
     
     print("\n" + "=" * 50)
     print("🎯 DEBUG RESULTS SUMMARY")
@@ -171,4 +184,4 @@ def main():
     print(f"      - Password: mypassword123")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
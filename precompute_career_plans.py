@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Precompute parsed study plans for common professions
+Runs each profession's template career plan through the local model once
+and writes the results to app/services/precomputed_plans.json, so the
+service can answer those requests without running the model.
+"""
+import asyncio
+import json
+
+from app.services.ai_service import AIAssistantService, PRECOMPUTED_PLANS_PATH
+
+async def precompute():
+    service = AIAssistantService()
+    service._precomputed = {}  # Always regenerate rather than re-serving the old file
+    professions = [kw for data in service._PROFESSION_PLANS.values() for kw in data["keywords"]]
+    results = {}
+
+    print("=" * 70)
+    print(f"Precomputing study plans for {len(professions)} professions")
+    print("=" * 70)
+
+    for profession in professions:
+        plan = service._get_career_plan_template(profession)["response"]
+        result = await service.parse_career_plan_to_study_tasks(plan, profession)
+        if result.get("success") and result.get("parsed"):
+            results[profession.lower()] = {
+                "plan_sha256": service._plan_digest(plan),
+                "result": result,
+            }
+            print(f"✅ {profession}")
+        else:
+            print(f"⚠️ {profession}: skipped ({result.get('error', 'output did not validate')})")
+
+    PRECOMPUTED_PLANS_PATH.write_text(json.dumps(results, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\n✅ Wrote {len(results)} plans to {PRECOMPUTED_PLANS_PATH}")
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(precompute())
+    except KeyboardInterrupt:
+        print("\n⚠️  Precompute interrupted by user")
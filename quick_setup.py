@@ -20,13 +20,14 @@ async def setup_test_user():
         "full_name": "Test Student"
     }
     
-    async with httpx.AsyncClient() as client:
+    # One client for all three steps so register -> login -> chat share a keep-alive connection
+    async with httpx.AsyncClient(base_url=base_url, limits=httpx.Limits(max_keepalive_connections=4)) as client:
         try:
             print("\n1️⃣ Creating test user account...")
             
             # Register user
             register_response = await client.post(
-                f"{base_url}/auth/register",
+                "/auth/register",
                 json=test_user
             )
             
@@ -46,7 +47,7 @@ async def setup_test_user():
             }
             
             login_response = await client.post(
-                f"{base_url}/auth/login",
+                "/auth/login",
                 data=login_data
             )
             
@@ -66,7 +67,7 @@ async def setup_test_user():
                 }
                 
                 chat_response = await client.post(
-                    f"{base_url}/ai/chat",
+                    "/ai/chat",
                     json=chat_request,
                     headers=headers,
                     timeout=30.0
@@ -9,6 +9,20 @@ import subprocess
 import shutil
 from pathlib import Path
 
+# Virtual environment executables, resolved once for the current platform
+if os.name == 'nt':  # Windows
+    PY = "venv\\Scripts\\python"
+    PIP = "venv\\Scripts\\pip"
+else:  # Unix/Linux/macOS
+    PY = "venv/bin/python"
+    PIP = "venv/bin/pip"
+
+# Child command lines
+CREATE_VENV_ARGV = (sys.executable, "-m", "venv", "venv")
+INSTALL_ARGV = (PIP, "install", "-r", "requirements-minimal.txt")
+INIT_DB_ARGV = (PY, "-m", "app.core.init_db")
+SERVER_ARGV = (PY, "-m", "uvicorn", "app.main:app", "--reload")
+
 def check_python_version():
     """Check if Python version is 3.8+"""
     if sys.version_info < (3, 8):
@@ -18,9 +32,14 @@ def check_python_version():
     print(f"✅ Python {sys.version.split()[0]} is compatible")
     return True
 
-def check_virtual_environment():
+def list_project_root():
+    """Names in the project root, read with one scandir instead of a stat per check"""
+    with os.scandir(".") as entries:
+        return {entry.name for entry in entries}
+
+def check_virtual_environment(top):
     """Check if running in virtual environment"""
-    venv_exists = Path("venv").exists()
+    venv_exists = "venv" in top
     in_venv = hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix)
     
     return venv_exists, in_venv
@@ -29,7 +48,7 @@ def create_virtual_environment():
     """Create a virtual environment"""
     print("📦 Creating virtual environment...")
     try:
-        subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+        subprocess.run(CREATE_VENV_ARGV, check=True)
         print("✅ Virtual environment created")
         return True
     except subprocess.CalledProcessError:
@@ -41,12 +60,7 @@ def install_dependencies():
     print("📥 Installing dependencies...")
     try:
         # Use the virtual environment's pip
-        if os.name == 'nt':  # Windows
-            pip_path = "venv\\Scripts\\pip"
-        else:  # Unix/Linux/macOS
-            pip_path = "venv/bin/pip"
-        
-        subprocess.run([pip_path, "install", "-r", "requirements-minimal.txt"], check=True)
+        subprocess.run(INSTALL_ARGV, check=True)
         print("✅ Dependencies installed successfully")
         return True
     except subprocess.CalledProcessError:
@@ -56,18 +70,18 @@ def install_dependencies():
         print("❌ Virtual environment pip not found")
         return False
 
-def setup_environment_file():
+def setup_environment_file(top):
     """Set up environment configuration"""
     env_file = Path(".env")
     env_example = Path(".env.example")
     
-    if not env_file.exists() and env_example.exists():
+    if ".env" not in top and ".env.example" in top:
         print("🔧 Setting up environment configuration...")
         shutil.copy(env_example, env_file)
         print("✅ Environment file created (.env)")
         print("⚠️  Please edit .env file with your actual configuration values")
         return True
-    elif env_file.exists():
+    elif ".env" in top:
         print("✅ Environment file already exists")
         return True
     else:
@@ -95,12 +109,7 @@ def initialize_database():
     print("🗄️  Initializing database...")
     try:
         # Use the virtual environment's python
-        if os.name == 'nt':  # Windows
-            python_path = "venv\\Scripts\\python"
-        else:  # Unix/Linux/macOS  
-            python_path = "venv/bin/python"
-        
-        subprocess.run([python_path, "-m", "app.core.init_db"], check=True)
+        subprocess.run(INIT_DB_ARGV, check=True)
         print("✅ Database initialized successfully")
         return True
     except subprocess.CalledProcessError:
@@ -115,16 +124,10 @@ def start_server():
     """Start the development server"""
     print("🚀 Starting development server...")
     try:
-        # Use the virtual environment's python
-        if os.name == 'nt':  # Windows
-            python_path = "venv\\Scripts\\python"
-        else:  # Unix/Linux/macOS
-            python_path = "venv/bin/python"
-        
         print("✅ Server starting at http://localhost:8000")
         print("📚 API docs available at http://localhost:8000/docs")
         print("🔧 Press Ctrl+C to stop the server")
-        subprocess.run([python_path, "-m", "uvicorn", "app.main:app", "--reload"], check=True)
+        subprocess.run(SERVER_ARGV, check=True)
     except KeyboardInterrupt:
         print("\n👋 Server stopped")
     except subprocess.CalledProcessError:
@@ -141,11 +144,13 @@ def main():
         sys.exit(1)
     
     # Check virtual environment
-    venv_exists, in_venv = check_virtual_environment()
+    top = list_project_root()
+    venv_exists, in_venv = check_virtual_environment(top)
     
     if not venv_exists:
         if not create_virtual_environment():
             sys.exit(1)
+        top = list_project_root()
     else:
         print("✅ Virtual environment already exists")
     
@@ -164,7 +169,7 @@ def main():
             sys.exit(1)
     
     # Setup environment
-    setup_environment_file()
+    setup_environment_file(top)
     
     # Configuration reminders
     check_database_config()
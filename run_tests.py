@@ -3,16 +3,25 @@
 StudyWiseAI Test Suite Runner
 Automatically starts server and runs all tests
 """
+import os
 import subprocess
 import time
 import sys
 import signal
 from pathlib import Path
 import psutil
+import requests
+
+# Virtualenv interpreter, relative to the project root
+VENV_PYTHON = "venv/Scripts/python.exe" if os.name == 'nt' else "venv/bin/python"
 
 class TestSuiteRunner:
     def __init__(self):
-        self.base_path = Path("C:/Code/StudyWiseAI")
+        self.base_path = Path(__file__).resolve().parent
+        self.py = str(self.base_path / VENV_PYTHON)
+        # Child command lines, built once per runner
+        self.uvicorn_argv = (self.py, "-m", "uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000")
+        self.quick_test_argv = (self.py, "quick_test.py")
         self.server_process = None
         
     def kill_existing_servers(self):
@@ -20,15 +29,18 @@ class TestSuiteRunner:
         print("🔍 Checking for existing servers...")
         
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+            # One system-wide socket table scan instead of a connections() call per process
+            pids = {
+                conn.pid for conn in psutil.net_connections(kind='tcp')
+                if conn.laddr and conn.laddr.port == 8000
+                and conn.status == psutil.CONN_LISTEN and conn.pid
+            }
+            for pid in pids:
                 try:
-                    # Check if process is using port 8000
-                    for conn in proc.connections():
-                        if conn.laddr.port == 8000:
-                            print(f"🛑 Killing existing server process {proc.pid}")
-                            proc.terminate()
-                            proc.wait(timeout=5)
-                            break
+                    proc = psutil.Process(pid)
+                    print(f"🛑 Killing existing server process {pid}")
+                    proc.terminate()
+                    proc.wait(timeout=5)
                 except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                     continue
         except Exception as e:
@@ -43,31 +55,35 @@ class TestSuiteRunner:
         
         try:
             # Start server in background
-            self.server_process = subprocess.Popen([
-                str(self.base_path / "venv/Scripts/python.exe"),
-                "-m", "uvicorn", 
-                "app.main:app",
-                "--host", "0.0.0.0",
-                "--port", "8000"
-            ],
+            self.server_process = subprocess.Popen(
+            self.uvicorn_argv,
             cwd=self.base_path,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE
             )
             
-            # Wait for server to start
+            # Poll /health until the server answers instead of sleeping a fixed time
             print("⏳ Waiting for server to initialize...")
-            time.sleep(8)  # Give server time to fully start
+            for _ in range(60):  # ~15s cap at 0.25s per attempt
+                if self.server_process.poll() is not None:
+                    print("❌ Server failed to start")
+                    return False
+                try:
+                    if requests.get("http://localhost:8000/health", timeout=0.5).ok:
+                        print("✅ Server started successfully")
+                        return True
+                except requests.RequestException:
+                    pass
+                time.sleep(0.25)
             
-            if self.server_process.poll() is None:
-                print("✅ Server started successfully")
-                return True
-            else:
-                print("❌ Server failed to start")
-                return False
+            print("❌ Server did not become healthy in time")
+            # Don't leave a half-started server holding port 8000
+            self.stop_server()
+            return False
                 
         except Exception as e:
             print(f"❌ Failed to start server: {e}")
+            self.stop_server()
             return False
     
     def stop_server(self):
@@ -79,6 +95,7 @@ class TestSuiteRunner:
                 self.server_process.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 self.server_process.kill()
+                self.server_process.wait()
             print("✅ Server stopped")
     
     def run_quick_test(self):
@@ -88,10 +105,8 @@ class TestSuiteRunner:
         print("="*60)
         
         try:
-            result = subprocess.run([
-                str(self.base_path / "venv/Scripts/python.exe"),
-                "quick_test.py"
-            ],
+            result = subprocess.run(
+            self.quick_test_argv,
             cwd=self.base_path,
             timeout=600  # 10 minutes max
             )
@@ -176,8 +191,8 @@ def main():
             print("\n✅ Server is running at http://localhost:8000")
             print("Press Ctrl+C to stop the server")
             try:
-                while True:
-                    time.sleep(1)
+                # Block until the server exits instead of waking every second
+                runner.server_process.wait()
             except KeyboardInterrupt:
                 runner.stop_server()
         else:
@@ -1,19 +1,46 @@
 #!/usr/bin/env python3
 """
-Direct AI Features Test using FastAPI TestClient
+Direct AI Features Test using an in-process ASGI client
 Tests AI features directly without HTTP requests
 """
+import asyncio
+import functools
 import os
 import sys
-import random
+from pathlib import Path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from fastapi.testclient import TestClient
+import httpx
 from app.main import app
-from app.core.database import create_tables
+from app.core.config import settings
+from app.core.database import create_tables, engine
+from tests._harness import (
+    JSON_HEADERS, clear_user_fixture, json_body, json_bytes, load_or_create_user_async
+)
 
-# Create test client
-client = TestClient(app)
+ROOT = Path(__file__).resolve().parent
+# Written after a successful create_tables(); holds the database URL it applies to
+SCHEMA_MARKER = ROOT / ".schema_ready"
+
+def _schema_marker_valid():
+    """True if the marker is for this database and newer than every model module"""
+    try:
+        marker = SCHEMA_MARKER.stat()
+        if SCHEMA_MARKER.read_text(encoding="utf-8") != settings.DATABASE_URL:
+            return False
+        if engine.url.get_backend_name() == "sqlite" and not os.path.exists(engine.url.database or ""):
+            return False
+        return all(model.stat().st_mtime <= marker.st_mtime for model in (ROOT / "app" / "models").glob("*.py"))
+    except OSError:
+        return False
+
+@functools.lru_cache(maxsize=1)
+def _ensure_schema():
+    """Create the tables at most once per process, and not at all while the schema marker is current"""
+    if _schema_marker_valid():
+        return
+    create_tables()
+    SCHEMA_MARKER.write_text(settings.DATABASE_URL, encoding="utf-8")
 
 class DirectAITester:
     def __init__(self):
@@ -21,51 +48,42 @@ class DirectAITester:
         self.user_data = None
         
         # Initialize database
-        create_tables()
+        _ensure_schema()
+        
+        # Calls go straight into the app on this event loop: no sockets, no TestClient portal thread.
+        # No timeout, matching TestClient; AI calls can take minutes while the model loads.
+        self.client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+            timeout=None
+        )
     
-    def register_and_login(self):
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+    
+    async def register_and_login(self):
         """Register a test user and get auth token"""
         print("🔐 Setting up test user...")
         
-        # Generate unique user
-        user_id = random.randint(1000, 9999)
-        test_user = {
-            "email": f"aitest{user_id}@example.com",
-            "username": f"aitest{user_id}",
-            "password": "testpass123",
-            "full_name": "AI Test User"
-        }
-        
-        # Register
-        response = client.post("/api/auth/register", json=test_user)
-        if response.status_code != 200:
-            print(f"❌ Registration failed: {response.text}")
-            return False
-        
-        # Login
-        login_data = {
-            "username": test_user["email"],
-            "password": test_user["password"]
-        }
-        response = client.post("/api/auth/login", data=login_data)
-        if response.status_code != 200:
-            print(f"❌ Login failed: {response.text}")
+        # Reuse the cached test user; registration only happens on the first run
+        try:
+            fixture = await load_or_create_user_async(self.client)
+        except Exception as e:
+            print(f"❌ {e}")
             return False
         
-        data = response.json()
-        self.auth_token = data["access_token"]
-        self.user_data = data["user"]
-        print("✅ Test user authenticated successfully")
+        self.auth_token = fixture["token"]
+        self.user_data = fixture["user"]
+        # Every later request is authenticated, so set the header once on the client
+        self.client.headers["Authorization"] = f"Bearer {self.auth_token}"
+        print(f"✅ Test user authenticated successfully ({fixture['source']})")
         return True
     
-    def get_headers(self):
-        """Get authorization headers"""
-        return {"Authorization": f"Bearer {self.auth_token}"}
-    
-    def test_ai_chat(self):
+    async def test_ai_chat(self):
         """Test AI chat functionality"""
-        print("\n💬 Testing AI Chat Assistant...")
-        
         test_messages = [
             "Hello! Can you help me study?",
             "What's the best way to learn Python programming?",
@@ -73,104 +91,95 @@ class DirectAITester:
             "Can you explain what machine learning is?"
         ]
         
+        # Bodies are encoded once up front; independent prompts are sent together and reported in order
+        bodies = [json_bytes({"message": message, "context": None}) for message in test_messages]
+        responses = await asyncio.gather(
+            *(self.client.post("/api/ai/chat", content=body, headers=JSON_HEADERS) for body in bodies),
+            return_exceptions=True
+        )
+        
+        print("\n💬 Testing AI Chat Assistant...")
+        
         success_count = 0
-        for i, message in enumerate(test_messages, 1):
-            try:
-                response = client.post(
-                    "/api/ai/chat",
-                    headers=self.get_headers(),
-                    json={"message": message, "context": None}
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"✅ Chat {i}/{len(test_messages)}: Response received")
-                    print(f"   Q: {message}")
-                    print(f"   A: {data['response'][:80]}...")
-                    success_count += 1
-                else:
-                    print(f"❌ Chat {i}/{len(test_messages)} failed: {response.status_code}")
-                    print(f"   Error: {response.text}")
-                    
-            except Exception as e:
-                print(f"❌ Chat {i}/{len(test_messages)} error: {e}")
+        for i, (message, response) in enumerate(zip(test_messages, responses), 1):
+            if isinstance(response, Exception):
+                print(f"❌ Chat {i}/{len(test_messages)} error: {response}")
+            elif response.status_code == 200:
+                data = json_body(response)
+                print(f"✅ Chat {i}/{len(test_messages)}: Response received")
+                print(f"   Q: {message}")
+                print(f"   A: {data['response'][:80]}...")
+                success_count += 1
+            else:
+                print(f"❌ Chat {i}/{len(test_messages)} failed: {response.status_code}")
+                print(f"   Error: {response.text}")
         
         return success_count, len(test_messages)
     
-    def test_study_plan_generation(self):
+    async def test_study_plan_generation(self):
         """Test study plan generation"""
-        print("\n📚 Testing Study Plan Generation...")
-        
         test_plans = [
             {"subject": "Python Programming", "duration_weeks": 4, "difficulty_level": "beginner"},
             {"subject": "Mathematics", "duration_weeks": 6, "difficulty_level": "intermediate"}
         ]
         
+        responses = await asyncio.gather(
+            *(self.client.post("/api/ai/generate-study-plan", content=json_bytes(plan), headers=JSON_HEADERS)
+              for plan in test_plans),
+            return_exceptions=True
+        )
+        
+        print("\n📚 Testing Study Plan Generation...")
+        
         success_count = 0
-        for i, plan in enumerate(test_plans, 1):
-            try:
-                response = client.post(
-                    "/api/ai/generate-study-plan",
-                    headers=self.get_headers(),
-                    json=plan
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"✅ Study Plan {i}/{len(test_plans)}: Generated for {plan['subject']}")
-                    success_count += 1
-                else:
-                    print(f"❌ Study Plan {i}/{len(test_plans)} failed: {response.status_code}")
-                    print(f"   Error: {response.text}")
-                    
-            except Exception as e:
-                print(f"❌ Study Plan {i}/{len(test_plans)} error: {e}")
+        for i, (plan, response) in enumerate(zip(test_plans, responses), 1):
+            if isinstance(response, Exception):
+                print(f"❌ Study Plan {i}/{len(test_plans)} error: {response}")
+            elif response.status_code == 200:
+                print(f"✅ Study Plan {i}/{len(test_plans)}: Generated for {plan['subject']}")
+                success_count += 1
+            else:
+                print(f"❌ Study Plan {i}/{len(test_plans)} failed: {response.status_code}")
+                print(f"   Error: {response.text}")
         
         return success_count, len(test_plans)
     
-    def test_quiz_generation(self):
+    async def test_quiz_generation(self):
         """Test quiz generation"""
-        print("\n🧠 Testing Quiz Generation...")
-        
         quiz_tests = [
             {"topic": "Python basics", "difficulty": "beginner", "question_count": 3},
             {"topic": "World History", "difficulty": "intermediate", "question_count": 2}
         ]
         
+        responses = await asyncio.gather(
+            *(self.client.post("/api/ai/generate-quiz", content=json_bytes(quiz), headers=JSON_HEADERS)
+              for quiz in quiz_tests),
+            return_exceptions=True
+        )
+        
+        print("\n🧠 Testing Quiz Generation...")
+        
         success_count = 0
-        for i, quiz in enumerate(quiz_tests, 1):
-            try:
-                response = client.post(
-                    "/api/ai/generate-quiz",
-                    headers=self.get_headers(),
-                    json=quiz
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    print(f"✅ Quiz {i}/{len(quiz_tests)}: Generated for {quiz['topic']}")
-                    success_count += 1
-                else:
-                    print(f"❌ Quiz {i}/{len(quiz_tests)} failed: {response.status_code}")
-                    print(f"   Error: {response.text}")
-                    
-            except Exception as e:
-                print(f"❌ Quiz {i}/{len(quiz_tests)} error: {e}")
+        for i, (quiz, response) in enumerate(zip(quiz_tests, responses), 1):
+            if isinstance(response, Exception):
+                print(f"❌ Quiz {i}/{len(quiz_tests)} error: {response}")
+            elif response.status_code == 200:
+                print(f"✅ Quiz {i}/{len(quiz_tests)}: Generated for {quiz['topic']}")
+                success_count += 1
+            else:
+                print(f"❌ Quiz {i}/{len(quiz_tests)} failed: {response.status_code}")
+                print(f"   Error: {response.text}")
         
         return success_count, len(quiz_tests)
     
-    def test_progress_insights(self):
+    async def test_progress_insights(self):
         """Test progress insights"""
-        print("\n📈 Testing Progress Insights...")
-        
         try:
-            response = client.get(
-                "/api/ai/progress-insights",
-                headers=self.get_headers()
-            )
+            response = await self.client.get("/api/ai/progress-insights")
             
+            print("\n📈 Testing Progress Insights...")
             if response.status_code == 200:
-                data = response.json()
+                data = json_body(response)
                 print("✅ Progress Insights: Generated successfully")
                 insights = data.get("insights", "No insights available")
                 print(f"   Insights: {insights[:80]}...")
@@ -181,21 +190,17 @@ class DirectAITester:
                 return 0, 1
                 
         except Exception as e:
-            print(f"❌ Progress Insights error: {e}")
+            print(f"\n📈 Testing Progress Insights...\n❌ Progress Insights error: {e}")
             return 0, 1
     
-    def test_chat_history(self):
+    async def test_chat_history(self):
         """Test chat history"""
-        print("\n📜 Testing Chat History...")
-        
         try:
-            response = client.get(
-                "/api/ai/chat-history",
-                headers=self.get_headers()
-            )
+            response = await self.client.get("/api/ai/chat-history")
             
+            print("\n📜 Testing Chat History...")
             if response.status_code == 200:
-                data = response.json()
+                data = json_body(response)
                 print(f"✅ Chat History: Retrieved {len(data)} messages")
                 return 1, 1
             else:
@@ -203,15 +208,14 @@ class DirectAITester:
                 return 0, 1
                 
         except Exception as e:
-            print(f"❌ Chat History error: {e}")
+            print(f"\n📜 Testing Chat History...\n❌ Chat History error: {e}")
             return 0, 1
     
-    def test_frontend_availability(self):
+    async def test_frontend_availability(self):
         """Test if frontend is available"""
-        print("\n🌐 Testing Frontend Availability...")
-        
         try:
-            response = client.get("/")
+            response = await self.client.get("/")
+            print("\n🌐 Testing Frontend Availability...")
             if response.status_code == 200:
                 print("✅ Frontend: Home page loads successfully")
                 return 1, 1
@@ -220,40 +224,31 @@ class DirectAITester:
                 return 0, 1
                 
         except Exception as e:
-            print(f"❌ Frontend error: {e}")
+            print(f"\n🌐 Testing Frontend Availability...\n❌ Frontend error: {e}")
             return 0, 1
     
-    def run_comprehensive_test(self):
+    async def run_comprehensive_test(self):
         """Run all AI feature tests"""
         print("🤖 StudyWiseAI - Direct AI Features Test")
         print("=" * 50)
         
         # Setup authentication
-        if not self.register_and_login():
+        if not await self.register_and_login():
             print("❌ Authentication setup failed")
             return
         
-        # Run tests
-        test_results = {}
-        
-        # Test individual features
-        chat_pass, chat_total = self.test_ai_chat()
-        test_results["AI Chat Assistant"] = (chat_pass, chat_total)
-        
-        plan_pass, plan_total = self.test_study_plan_generation()
-        test_results["Study Plan Generation"] = (plan_pass, plan_total)
-        
-        quiz_pass, quiz_total = self.test_quiz_generation()
-        test_results["Quiz Generation"] = (quiz_pass, quiz_total)
-        
-        insights_pass, insights_total = self.test_progress_insights()
-        test_results["Progress Insights"] = (insights_pass, insights_total)
-        
-        history_pass, history_total = self.test_chat_history()
-        test_results["Chat History"] = (history_pass, history_total)
-        
-        frontend_pass, frontend_total = self.test_frontend_availability()
-        test_results["Frontend Website"] = (frontend_pass, frontend_total)
+        # The feature blocks only share the (read-only) auth token, so run them all at once;
+        # each block prints its header and results in one piece once its requests complete
+        features = {
+            "AI Chat Assistant": self.test_ai_chat,
+            "Study Plan Generation": self.test_study_plan_generation,
+            "Quiz Generation": self.test_quiz_generation,
+            "Progress Insights": self.test_progress_insights,
+            "Chat History": self.test_chat_history,
+            "Frontend Website": self.test_frontend_availability
+        }
+        outcomes = await asyncio.gather(*(test() for test in features.values()))
+        test_results = dict(zip(features, outcomes))
         
         # Summary
         print("\n" + "=" * 60)
@@ -262,10 +257,20 @@ class DirectAITester:
         
         total_passed = 0
         total_tests = 0
+        # Rows, totals and status buckets all come from this one pass over the results
+        buckets = {"working": [], "partial": [], "broken": []}
         
         for feature, (passed, total) in test_results.items():
             percentage = (passed/total*100) if total > 0 else 0
-            status = "✅ WORKING" if passed == total else f"⚠️ PARTIAL ({passed}/{total})" if passed > 0 else "❌ FAILED"
+            if passed == total:
+                status = "✅ WORKING"
+                buckets["working"].append(feature)
+            elif passed > 0:
+                status = f"⚠️ PARTIAL ({passed}/{total})"
+                buckets["partial"].append(f"{feature} ({passed}/{total})")
+            else:
+                status = "❌ FAILED"
+                buckets["broken"].append(feature)
             print(f"{feature:<25} {status:>15} ({percentage:3.0f}%)")
             total_passed += passed
             total_tests += total
@@ -278,18 +283,9 @@ class DirectAITester:
         print("\n📋 FEATURE STATUS REPORT:")
         print("-" * 30)
         
-        # Detailed analysis
-        working_features = []
-        partial_features = []
-        broken_features = []
-        
-        for feature, (passed, total) in test_results.items():
-            if passed == total:
-                working_features.append(feature)
-            elif passed > 0:
-                partial_features.append(f"{feature} ({passed}/{total})")
-            else:
-                broken_features.append(feature)
+        working_features = buckets["working"]
+        partial_features = buckets["partial"]
+        broken_features = buckets["broken"]
         
         if working_features:
             print(f"✅ FULLY WORKING: {', '.join(working_features)}")
@@ -311,11 +307,19 @@ class DirectAITester:
         else:
             print("🔧 NEEDS WORK! Many AI features require fixes before deployment.")
 
+async def run_tests():
+    """Run the suite with the tester's client closed afterwards"""
+    async with DirectAITester() as tester:
+        await tester.run_comprehensive_test()
+
 def main():
     print("Starting Direct AI Features Integration Test...\n")
     
-    tester = DirectAITester()
-    tester.run_comprehensive_test()
+    # --clear-fixture: forget the cached test user and register a new one
+    if "--clear-fixture" in sys.argv:
+        clear_user_fixture()
+    
+    asyncio.run(run_tests())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
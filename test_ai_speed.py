@@ -6,58 +6,28 @@ Tests AI response speed to diagnose "stuck on thinking" issues
 
 import requests
 import time
-import json
-from datetime import datetime
+
+from tests._harness import get_ready_session
 
 BASE_URL = "http://localhost:8000"
 
-def print_status(message, status="INFO"):
-    timestamp = datetime.now().strftime("%H:%M:%S")
-    if status == "SUCCESS":
-        print(f"[{timestamp}] ✅ {message}")
-    elif status == "FAIL":
-        print(f"[{timestamp}] ❌ {message}")
-    elif status == "WARN":
-        print(f"[{timestamp}] ⚠️ {message}")
-    else:
-        print(f"[{timestamp}] ℹ️ {message}")
+# Status -> prefix emoji; anything unknown is shown as INFO
+_STATUS_PREFIX = {"SUCCESS": "✅", "FAIL": "❌", "WARN": "⚠️", "INFO": "ℹ️"}
 
-def quick_login():
-    """Quick login with fresh credentials"""
-    try:
-        # Use existing user or create fresh one
-        login_data = {
-            "username": "fresh1234@example.com",
-            "password": "freshpass123"
-        }
-        
-        response = requests.post(f"{BASE_URL}/api/auth/login", data=login_data, timeout=10)
-        
-        if response.status_code == 200:
-            token = response.json().get("access_token")
-            print_status("Logged in successfully", "SUCCESS")
-            return token
-        else:
-            print_status(f"Login failed: {response.status_code}", "FAIL")
-            return None
-            
-    except Exception as e:
-        print_status(f"Login error: {e}", "FAIL")
-        return None
+def print_status(message, status="INFO"):
+    print(f"[{time.strftime('%H:%M:%S')}] {_STATUS_PREFIX.get(status, 'ℹ️')} {message}")
 
-def test_ai_response_time(token, question, timeout=30):
+def test_ai_response_time(session, question, timeout=30):
     """Test single AI response time"""
     try:
-        headers = {"Authorization": f"Bearer {token}"}
         data = {"message": question}
         
         print_status(f"Asking AI: '{question[:50]}...'", "INFO")
         start_time = time.time()
         
-        response = requests.post(
+        response = session.post(
             f"{BASE_URL}/api/ai/chat", 
             json=data, 
-            headers=headers, 
             timeout=timeout
         )
         
@@ -85,23 +55,15 @@ def main():
     print("🚀 StudyWiseAI - Quick AI Response Time Test")
     print("=" * 55)
     
-    # Check server
+    # Wait for the server and log in with the shared cached test user
     try:
-        response = requests.get(f"{BASE_URL}/", timeout=5)
-        if response.status_code == 200:
-            print_status("Server is running", "SUCCESS")
-        else:
-            print_status("Server check failed", "FAIL")
-            return
-    except:
-        print_status("Cannot connect to server", "FAIL")
-        return
-    
-    # Login
-    token = quick_login()
-    if not token:
-        print_status("Cannot proceed without authentication", "FAIL")
+        session = get_ready_session(BASE_URL)
+    except Exception as e:
+        print_status(f"{e}", "FAIL")
+        print_status("Cannot proceed without a running server and authentication", "FAIL")
         return
+    print_status("Server is running", "SUCCESS")
+    print_status(f"Logged in successfully ({session.test_user['source']})", "SUCCESS")
     
     # Test different AI requests with increasing complexity
     test_questions = [
@@ -115,7 +77,7 @@ def main():
     
     for question, description in test_questions:
         print(f"\n📝 Testing: {description}")
-        success, elapsed = test_ai_response_time(token, question, timeout=45)
+        success, elapsed = test_ai_response_time(session, question, timeout=45)
         results.append((description, success, elapsed))
         
         if not success and elapsed >= 45:
@@ -128,13 +90,18 @@ def main():
     print("=" * 55)
     
     total_tests = len(results)
-    successful_tests = sum(1 for _, success, _ in results if success)
+    successful_tests = 0
+    total_elapsed = 0.0
     
+    # Print each row and accumulate the passing times in the same pass
     for description, success, elapsed in results:
         status = "✅ PASS" if success else "❌ FAIL"
         print(f"{description:<20} {elapsed:>6.1f}s  {status}")
+        if success:
+            successful_tests += 1
+            total_elapsed += elapsed
     
-    avg_time = sum(elapsed for _, success, elapsed in results if success) / max(successful_tests, 1)
+    avg_time = total_elapsed / max(successful_tests, 1)
     
     print("-" * 55)
     print(f"Tests Passed: {successful_tests}/{total_tests}")
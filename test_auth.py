@@ -3,22 +3,29 @@
 Simple test script to verify authentication is working
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
-import random
+import uuid
+
+# One pooled keep-alive session for every request in this script
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
 
 def test_registration():
     """Test user registration endpoint"""
     url = "http://localhost:8000/api/auth/register"
     
+    # One id for both fields; uuid rather than randint so reruns never collide
+    user_id = uuid.uuid4().hex[:8]
     test_user = {
-        "email": f"test{random.randint(1000,9999)}@example.com",
-        "username": f"testuser{random.randint(1000,9999)}",
+        "email": f"test{user_id}@example.com",
+        "username": f"testuser{user_id}",
         "password": "test123456",
         "full_name": "Test User"
     }
     
     try:
-        response = requests.post(url, json=test_user)
+        response = SESSION.post(url, json=test_user)
         print(f"Status Code: {response.status_code}")
         print(f"Response: {response.text}")
         
@@ -39,7 +46,7 @@ def test_registration():
 def test_server_health():
     """Test if server is responding"""
     try:
-        response = requests.get("http://localhost:8000/")
+        response = SESSION.get("http://localhost:8000/")
         print(f"Server health check - Status: {response.status_code}")
         return response.status_code == 200
     except Exception as e:
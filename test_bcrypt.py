@@ -3,6 +3,10 @@
 Simple bcrypt test to diagnose the issue
 """
 import bcrypt
+import traceback
+
+# Minimum bcrypt cost: these checks are about correctness, not hash strength
+BCRYPT_ROUNDS = 4
 
 def test_bcrypt_directly():
     """Test bcrypt directly without passlib"""
@@ -14,7 +18,7 @@ def test_bcrypt_directly():
         
         # Hash the password
         password_bytes = password.encode('utf-8')
-        hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt())
+        hashed = bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
         print(f"✅ Password hashed successfully: {hashed}")
         
         # Verify the password
@@ -25,7 +29,6 @@ def test_bcrypt_directly():
         
     except Exception as e:
         print(f"❌ bcrypt test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
@@ -40,7 +43,7 @@ def test_passlib_simple():
         print(f"Password: {password}")
         
         # Hash the password
-        hashed = passlib_bcrypt.hash(password)
+        hashed = passlib_bcrypt.using(rounds=BCRYPT_ROUNDS).hash(password)
         print(f"✅ Password hashed successfully: {hashed}")
         
         # Verify the password
@@ -51,7 +54,6 @@ def test_passlib_simple():
         
     except Exception as e:
         print(f"❌ passlib simple test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
 
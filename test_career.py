@@ -1,25 +1,31 @@
-import requests
-import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-# Login
-login_data = {'username': 'test@studywiseai.com', 'password': 'testpass123'}
-login_resp = requests.post('http://localhost:8000/api/auth/login', data=login_data)
-print(f"Login Status: {login_resp.status_code}")
+from tests._harness import get_app_client
 
-if login_resp.status_code == 200:
-    token = login_resp.json()['access_token']
+# Login: an in-process client for the app as the shared cached test user. Its token is
+# reused from disk until it nears expiry, so most runs skip /login and its bcrypt check
+try:
+    SESSION = get_app_client()
+except Exception as e:
+    SESSION = None
+    print(f"Login failed: {e}")
+
+if SESSION is not None:
+    token = SESSION.test_user['token']
+    print(f"Login Status: {SESSION.test_user['source']}")
     print(f"Token obtained: {token[:20]}...")
     
-    # Call career counseling
-    headers = {'Authorization': f'Bearer {token}'}
+    # Call career counseling; the session carries the token from here on
     career_data = {'target_profession': 'Software Engineer'}
     
-    career_resp = requests.post(
-        'http://localhost:8000/api/ai/career-counseling/start',
-        json=career_data,
-        headers=headers
-    )
-    print(f"\nCareer Counseling Status: {career_resp.status_code}")
-    print(f"Response: {career_resp.text[:1000]}")
-else:
-    print(f"Login failed: {login_resp.text}")
+    # Stream the body and decode only the first KB that gets printed, not the whole plan
+    with SESSION.stream(
+        'POST',
+        '/api/ai/career-counseling/start',
+        json=career_data
+    ) as career_resp:
+        print(f"\nCareer Counseling Status: {career_resp.status_code}")
+        head = next(career_resp.iter_bytes(1000), b'')
+        print(f"Response: {head[:1000].decode('utf-8', 'ignore')}")
\ No newline at end of file
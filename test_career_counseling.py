@@ -5,6 +5,7 @@ Test script for Career Counseling feature
 import asyncio
 import sys
 import os
+import traceback
 
 # Add the app directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
@@ -31,12 +32,27 @@ async def test_career_counseling():
     print(f"🎓 User Goals: {test_user.study_goals}")
     print()
 
-    # Test 1: Start career counseling
-    print("📋 Test 1: Starting Career Counseling Session")
-    print("-" * 40)
+    user_responses = """
+            I am currently in high school with basic programming knowledge.
+            I enjoy problem-solving and creating things.
+            I have experience with Python basics and some web development.
+            I want to start my career in 4 years after college.
+            I am committed and willing to work hard.
+            """
 
     try:
-        result = await ai_service.start_career_counseling(test_user, target_profession)
+        # The plan doesn't depend on the session's questions, so both calls run together
+        start_task = asyncio.create_task(ai_service.start_career_counseling(test_user, target_profession))
+        plan_task = asyncio.create_task(ai_service.generate_career_action_plan(
+            test_user,
+            target_profession,
+            user_responses
+        ))
+        result, result2 = await asyncio.gather(start_task, plan_task)
+
+        # Test 1: Start career counseling
+        print("📋 Test 1: Starting Career Counseling Session")
+        print("-" * 40)
 
         if result["success"]:
             print("✅ Career counseling started successfully!")
@@ -48,20 +64,6 @@ async def test_career_counseling():
             print("📋 Test 2: Generating Career Action Plan")
             print("-" * 40)
 
-            user_responses = """
-            I am currently in high school with basic programming knowledge.
-            I enjoy problem-solving and creating things.
-            I have experience with Python basics and some web development.
-            I want to start my career in 4 years after college.
-            I am committed and willing to work hard.
-            """
-
-            result2 = await ai_service.generate_career_action_plan(
-                test_user,
-                target_profession,
-                user_responses
-            )
-
             if result2["success"]:
                 print("✅ Career action plan generated successfully!")
                 print("📝 Action Plan:")
@@ -76,7 +78,6 @@ async def test_career_counseling():
 
     except Exception as e:
         print(f"❌ Error during testing: {str(e)}")
-        import traceback
         traceback.print_exc()
 
 if __name__ == "__main__":
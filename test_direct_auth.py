@@ -4,12 +4,18 @@ Direct database test to isolate authentication issues
 """
 import os
 import sys
+import traceback
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import pytest
 from sqlalchemy.orm import Session
 from app.core.database import SessionLocal, engine, create_tables
 from app.models.database import User
 from app.core.auth import get_password_hash, verify_password
+from tests._harness import use_cheap_bcrypt
+
+# The hash only has to round-trip through the database, so use the cheapest bcrypt cost (conftest.py fixture)
+pytestmark = pytest.mark.usefixtures("cheap_bcrypt")
 
 def test_direct_auth():
     """Test authentication functions directly"""
@@ -52,22 +58,22 @@ def test_direct_auth():
             full_name="DB Test User"
         )
         
-        # Check if user already exists
+        # Everything from here runs in one transaction that is rolled back at the end,
+        # so the check exercises the INSERT without committing (or fsyncing) anything
         existing = db.query(User).filter(User.email == "dbtest@example.com").first()
         if existing:
             print("Deleting existing test user...")
             db.delete(existing)
-            db.commit()
+            db.flush()
         
         db.add(test_user)
-        db.commit()
+        db.flush()
         db.refresh(test_user)
         
         print(f"✅ User created successfully with ID: {test_user.id}")
         
         # Clean up
-        db.delete(test_user)
-        db.commit()
+        db.rollback()
         print("✅ Test user cleaned up")
         
         db.close()
@@ -75,7 +81,6 @@ def test_direct_auth():
         
     except Exception as e:
         print(f"❌ Database test failed: {e}")
-        import traceback
         traceback.print_exc()
         return False
     
@@ -83,6 +88,9 @@ def main():
     print("StudyWiseAI Direct Authentication Test")
     print("=" * 40)
     
+    # Same cheap bcrypt cost as the cheap_bcrypt fixture; the process ends after this run
+    use_cheap_bcrypt()
+    
     # Initialize database
     try:
         create_tables()
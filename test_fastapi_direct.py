@@ -2,18 +2,37 @@
 """
 Direct FastAPI test to diagnose endpoint issues
 """
+import asyncio
 import os
 import sys
-import random
+import traceback
+import uuid
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.database import create_tables
+from tests._harness import use_cheap_bcrypt
+
+# Registration hashes in-process, so the cheapest bcrypt cost keeps it fast (conftest.py fixture)
+pytestmark = pytest.mark.usefixtures("cheap_bcrypt")
 
 # Create test client
 client = TestClient(app)
 
+def make_test_user():
+    """Registration payload for a new, unique user"""
+    # One id for both fields; uuid rather than randint so reruns never collide
+    user_id = uuid.uuid4().hex[:8]
+    return {
+        "email": f"directtest{user_id}@example.com",
+        "username": f"directtest{user_id}",
+        "password": "test123456",
+        "full_name": "Direct Test User"
+    }
+
 def test_registration_endpoint():
     """Test the registration endpoint directly using FastAPI TestClient"""
     print("Testing registration endpoint with TestClient...")
@@ -21,13 +40,7 @@ def test_registration_endpoint():
     # Ensure database is initialized
     create_tables()
     
-    import random
-    test_user = {
-        "email": f"directtest{random.randint(1000,9999)}@example.com",
-        "username": f"directtest{random.randint(1000,9999)}",
-        "password": "test123456",
-        "full_name": "Direct Test User"
-    }
+    test_user = make_test_user()
     
     try:
         print(f"Sending registration request for: {test_user['email']}")
@@ -46,10 +59,24 @@ def test_registration_endpoint():
     
     except Exception as e:
         print(f"❌ Test failed with exception: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
+async def register_batch(count):
+    """Register count new users at once through the in-process ASGI app; returns how many succeeded"""
+    create_tables()
+    users = [make_test_user() for _ in range(count)]
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as ac:
+        responses = await asyncio.gather(
+            *(ac.post("/api/auth/register", json=user) for user in users),
+            return_exceptions=True
+        )
+    
+    failures = [r for r in responses if isinstance(r, Exception) or r.status_code != 200]
+    for failure in failures[:5]:
+        print(f"❌ {failure if isinstance(failure, Exception) else failure.text}")
+    return count - len(failures)
+
 def test_root_endpoint():
     """Test the root endpoint"""
     try:
@@ -64,6 +91,9 @@ if __name__ == "__main__":
     print("Direct FastAPI Endpoint Test")
     print("=" * 35)
     
+    # Same cheap bcrypt cost as the cheap_bcrypt fixture; the process ends after this run
+    use_cheap_bcrypt()
+    
     # Test root endpoint first
     root_works = test_root_endpoint()
     
@@ -71,5 +101,13 @@ if __name__ == "__main__":
         print("✅ Root endpoint works")
         print("\nTesting registration endpoint...")
         result = test_registration_endpoint()
+        
+        # --batch [N]: also register N (default 10) users concurrently as a smoke test
+        if "--batch" in sys.argv:
+            index = sys.argv.index("--batch")
+            count = int(sys.argv[index + 1]) if len(sys.argv) > index + 1 else 10
+            print(f"\nRegistering {count} users concurrently...")
+            ok = asyncio.run(register_batch(count))
+            print(f"{'✅' if ok == count else '❌'} Batch registration: {ok}/{count} succeeded")
     else:
         print("❌ Root endpoint failed, skipping registration test")
\ No newline at end of file
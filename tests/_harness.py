@@ -0,0 +1,212 @@
+"""
+Shared setup for the StudyWiseAI test scripts
+Keeps one registered test user on disk so repeated runs skip registration and bcrypt hashing
+"""
+import base64
+import json
+import os
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional; the stdlib decoder is used when it is missing
+    orjson = None
+
+FIXTURE_PATH = Path(__file__).resolve().parent.parent / ".studywise_test_user.json"
+# Re-login this many seconds before the cached token actually expires
+TOKEN_EXPIRY_MARGIN = 60
+# bcrypt cost for test runs that hash in-process: hashes only need to round-trip, not resist cracking
+TEST_BCRYPT_ROUNDS = 4
+
+def json_body(response):
+    """Decode a response's JSON body, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+# Send with pre-encoded bodies: client.post(url, content=json_bytes(obj), headers=JSON_HEADERS)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+def json_bytes(obj):
+    """Encode a request body once, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+def _token_exp(token):
+    """Read the exp claim from a JWT without verifying it; 0 if it can't be read"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(payload))["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return 0
+
+def _read_fixture():
+    try:
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_fixture(fixture):
+    # 0600: the file holds a live password and token
+    fd = os.open(FIXTURE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(fixture, f)
+
+def clear_user_fixture():
+    """Delete the cached test user so the next run registers a fresh one"""
+    try:
+        FIXTURE_PATH.unlink()
+        print(f"🧹 Removed {FIXTURE_PATH.name}")
+    except FileNotFoundError:
+        pass
+
+def _new_test_user():
+    # uuid rather than a small random int so concurrent runs never collide on email/username
+    user_id = uuid.uuid4().hex[:10]
+    return {
+        "email": f"aitest{user_id}@example.com",
+        "username": f"aitest{user_id}",
+        "password": "testpass123",
+        "full_name": "AI Test User"
+    }
+
+def _token_fresh(fixture):
+    return fixture.get("token_exp", 0) > time.time() + TOKEN_EXPIRY_MARGIN
+
+def _auth_headers(fixture):
+    return {"Authorization": f"Bearer {fixture['token']}"}
+
+def _apply_login(fixture, data):
+    fixture["token"] = data["access_token"]
+    fixture["token_exp"] = _token_exp(fixture["token"])
+    fixture["user"] = data["user"]
+
+def _save(fixture, source):
+    _write_fixture(fixture)
+    fixture["source"] = source
+    return fixture
+
+def _user_steps(api_url):
+    """
+    Cached-token check, re-login and registration as one sequence for both client flavours
+    Yields (method, url, kwargs) requests, is sent each response back and returns the fixture.
+    """
+    fixture = _read_fixture()
+    # An unexpired token still fails once its user is gone (deleted database, another server's DB),
+    # so it is only reused after /auth/me accepts it
+    if fixture and _token_fresh(fixture):
+        response = yield "get", f"{api_url}/auth/me", {"headers": _auth_headers(fixture)}
+        if response.status_code == 200:
+            fixture["source"] = "cached token"
+            return fixture
+    if fixture:
+        response = yield "post", f"{api_url}/auth/login", {
+            "data": {"username": fixture["email"], "password": fixture["password"]}}
+        if response.status_code == 200:
+            _apply_login(fixture, json_body(response))
+            return _save(fixture, "login")
+
+    # No usable cached user (first run, deleted database, changed password): register one
+    test_user = _new_test_user()
+    response = yield "post", f"{api_url}/auth/register", {"json": test_user}
+    if response.status_code != 200:
+        raise RuntimeError(f"Registration failed: {response.text}")
+    fixture = {"email": test_user["email"], "password": test_user["password"]}
+    response = yield "post", f"{api_url}/auth/login", {
+        "data": {"username": fixture["email"], "password": fixture["password"]}}
+    if response.status_code != 200:
+        raise RuntimeError(f"Login failed: {response.text}")
+    _apply_login(fixture, json_body(response))
+    return _save(fixture, "registered")
+
+def load_or_create_user(client, api_url="/api"):
+    """
+    Return the cached test user, logging in or registering only when needed
+    client is anything with requests-style get() and post() (requests.Session, TestClient);
+    the result has email, password, token, token_exp, user and source
+    ("cached token", "login" or "registered"). Raises RuntimeError on failure.
+    """
+    steps = _user_steps(api_url)
+    try:
+        method, url, kwargs = next(steps)
+        while True:
+            method, url, kwargs = steps.send(getattr(client, method)(url, **kwargs))
+    except StopIteration as done:
+        return done.value
+
+async def load_or_create_user_async(client, api_url="/api"):
+    """load_or_create_user for an httpx.AsyncClient"""
+    steps = _user_steps(api_url)
+    try:
+        method, url, kwargs = next(steps)
+        while True:
+            method, url, kwargs = steps.send(await getattr(client, method)(url, **kwargs))
+    except StopIteration as done:
+        return done.value
+
+def use_cheap_bcrypt():
+    """Hash with TEST_BCRYPT_ROUNDS for the rest of this process (test script entry points only)"""
+    from app.core.config import settings
+    settings.BCRYPT_ROUNDS = TEST_BCRYPT_ROUNDS
+
+def get_ready_session(base_url="http://localhost:8000", max_wait=5.0):
+    """
+    Pooled requests.Session for a running server, already authenticated as the cached test user
+    Polls /health with backoff for up to max_wait seconds; raises RuntimeError if the
+    server never answers or the test user can't be set up.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    deadline = time.monotonic() + max_wait
+    delay = 0.25
+    while True:
+        try:
+            if session.get(f"{base_url}/health", timeout=(0.5, 5)).status_code == 200:
+                break
+        except requests.exceptions.RequestException:
+            pass
+        if time.monotonic() + delay > deadline:
+            session.close()
+            raise RuntimeError(f"StudyWiseAI server is not responding at {base_url}")
+        time.sleep(delay)
+        delay *= 2
+
+    try:
+        fixture = load_or_create_user(session, f"{base_url}/api")
+    except Exception:
+        session.close()
+        raise
+    session.headers["Authorization"] = f"Bearer {fixture['token']}"
+    session.test_user = fixture
+    return session
+
+def get_app_client():
+    """
+    In-process TestClient for app.main, already authenticated as the cached test user
+    Requests go straight into the ASGI app, so no server has to be running; the result
+    has the same test_user attribute as get_ready_session(). Raises RuntimeError if the
+    test user can't be set up.
+    """
+    from fastapi.testclient import TestClient
+    from app.core.database import create_tables
+    from app.main import app
+
+    # Startup events don't run without the client's context manager, so create the tables here
+    create_tables()
+    client = TestClient(app)
+    fixture = load_or_create_user(client)
+    client.headers["Authorization"] = f"Bearer {fixture['token']}"
+    client.test_user = fixture
+    return client